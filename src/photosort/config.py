@@ -5,8 +5,19 @@ __email__ = "miguelangel@ajo.es"
 __copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
 __license__ = "GPLv3"
 
+import hashlib
+
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader
+
+from .exceptions import ConfigError
+
+REQUIRED_OUTPUT_FIELDS = ('dir', 'db_file', 'duplicates_dir', 'chmod')
+
 
 class Config:
     """
@@ -15,7 +26,47 @@ class Config:
 
     def __init__(self, filename='/etc/photosort.yml'):
         with open(filename, 'r') as f_in:
-            self._data = yaml.safe_load(f_in)
+            self._data = yaml.load(f_in, Loader=SafeLoader)
+        self._validate()
+
+    def _validate(self):
+        """
+            Checks the fields needed to sort media once at load time, so
+            a broken file fails here with a ConfigError instead of a
+            KeyError in the middle of a sync
+        """
+        if not isinstance(self._data, dict):
+            raise ConfigError('<root>', "expected a mapping")
+
+        for section in ('sources', 'output'):
+            if not isinstance(self._data.get(section), dict):
+                raise ConfigError(section, "missing or not a mapping")
+
+        for name, source in self._data['sources'].items():
+            if not isinstance(source, dict) or 'dir' not in source:
+                raise ConfigError('sources.%s.dir' % name,
+                                  "missing required field")
+
+        output = self._data['output']
+        for field in REQUIRED_OUTPUT_FIELDS:
+            if field not in output:
+                raise ConfigError('output.' + field, "missing required field")
+
+        if 'dir_pattern' not in output and 'pattern' not in output:
+            raise ConfigError('output.dir_pattern', "missing required field")
+
+        try:
+            int(output['chmod'], 8)
+        except (TypeError, ValueError):
+            raise ConfigError('output.chmod',
+                              "%r is not an octal mode" % output['chmod'])
+
+        try:
+            hashlib.new(output.get('hash_algorithm', 'md5')).hexdigest()
+        except (TypeError, ValueError):
+            raise ConfigError('output.hash_algorithm',
+                              "%r is not a supported hashlib algorithm"
+                              % output['hash_algorithm'])
 
     def output_dir(self):
         return self._data['output']['dir']
@@ -67,5 +118,11 @@ class Config:
             else:
                 raise
 
+    def hash_algorithm(self):
+        if 'hash_algorithm' in self._data['output']:
+            return self._data['output']['hash_algorithm']
+        else:
+            return 'md5'
+
     def output_chmod(self):
         return int(self._data['output']['chmod'], 8)  # octal conversion
@@ -21,3 +21,17 @@ class DirError(Error):
     def __init__(self, expr, msg):
         self.expr = expr
         self.msg = msg
+
+
+class ConfigError(Error):
+    """Exception raised for errors in the configuration file.
+
+    Attributes:
+        expr -- configuration field in which the error occurred
+        msg  -- explanation of the error
+    """
+
+    def __init__(self, expr, msg):
+        super().__init__("%s: %s" % (expr, msg))
+        self.expr = expr
+        self.msg = msg
@@ -18,31 +18,36 @@ import sys
 from . import exif
 
 
+# media file type by lowercase extension, anything else is 'unknown'
+FILE_TYPES = {
+    **dict.fromkeys(('heic', 'jpeg', 'jpg', 'cr2', 'raw', 'png', 'arw', 'thm',
+                     'orf'), 'photo'),
+    **dict.fromkeys(('m4v', 'mpeg', 'mpg', 'mov', 'mp4', 'avi'), 'movie'),
+}
+
+
 class UnknownDatetime(Exception):
     pass
 
 
 class MediaFile:
 
-    def __init__(self, filename):
+    def __init__(self, filename, hash_algorithm='md5'):
         self._filename = filename
+        # hashlib algorithm used for the content hash stored in the DB
+        self._hash_algorithm = hash_algorithm
         self._file_type = MediaFile.guess_file_type(filename)
         self._hash = None
+        self._exif = None
 
     @staticmethod
     def guess_file_type(filename):
-        extension = filename.lower().split('.')[-1]
-        if extension in ('heic', 'jpeg', 'jpg', 'cr2', 'raw', 'png', 'arw',
-                         'thm', 'orf'):
-            return 'photo'
-        elif extension in ('m4v', 'mpeg', 'mpg', 'mov', 'mp4', 'avi'):
-            return 'movie'
-
-        return 'unknown'
+        extension = filename.rpartition('.')[2].lower()
+        return FILE_TYPES.get(extension, 'unknown')
 
     @staticmethod
-    def build_for(filename):
-        return MediaFile(filename)
+    def build_for(filename, hash_algorithm='md5'):
+        return MediaFile(filename, hash_algorithm)
 
     def get_filename(self):
         return os.path.basename(self._filename)
@@ -53,14 +58,15 @@ class MediaFile:
     def get_path(self):
         return self._filename
 
-    def md5_hash(self, hasher=None, blocksize=65536):
+    def content_hash(self, hasher=None, blocksize=1 << 20):
         if self._hash is not None:
             return self._hash
 
         if hasher is None:
-            hasher = hashlib.md5()
+            hasher = hashlib.new(self._hash_algorithm)
 
         with open(self._filename, 'rb') as afile:
+            self._advise_sequential(afile)
             buf = afile.read(blocksize)
             while len(buf) > 0:
                 hasher.update(buf)
@@ -69,9 +75,29 @@ class MediaFile:
             self._hash = hasher.hexdigest()
             return self._hash
 
+    @staticmethod
+    def _advise_sequential(afile):
+        """
+        Tells the kernel the whole file is going to be read in order, so
+        it can read ahead larger chunks and keep the disk queue busy
+        """
+        if not hasattr(os, 'posix_fadvise'):
+            return
+        try:
+            os.posix_fadvise(afile.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+        except OSError:
+            pass  # only a hint, some filesystems don't support it
+
     def _exif_data(self):
-        """Returns a dictionary from the exif data of an image. """
-        return exif.get_metadata(self._filename)
+        """Returns a dictionary from the exif data of an image.
+
+        The result is kept, datetime() and hash() are called several
+        times for each file while sorting it, and each lookup is an
+        exiftool round-trip.
+        """
+        if self._exif is None:
+            self._exif = exif.get_metadata(self._filename)
+        return self._exif
 
     def _exif_datetime(self):
         exif_datetime_str = ""
@@ -151,11 +177,11 @@ class MediaFile:
     def hash(self):
         """
         Builds an hexadecimal hash for a picture, extended with the
-        EXIF date as a string, to prevent as much as possible from md5
-        collisions
+        EXIF date as a string, to prevent as much as possible from
+        content hash collisions
         """
 
-        media_hash = self.md5_hash()
+        media_hash = self.content_hash()
         exif_datetime = self._exif_datetime()
 
         if exif_datetime is not None:
@@ -43,10 +43,7 @@ class PhotoDB:
                     logging.info("DB was empty")
                     return
 
-                for file_dir, file_name, file_type, hash in dbreader:
-                    self._hashes[hash] = {'dir': file_dir,
-                                          'name': file_name,
-                                          'type': file_type}
+                self._ingest_rows(dbreader)
             logging.info("DB Load finished, %d entries", len(self._hashes))
         except IOError as e:
             if e.errno == 2:
@@ -57,6 +54,15 @@ class PhotoDB:
                 logging.error("Error opening DB file %s", self._db_file)
                 raise
 
+    def _ingest_rows(self, rows):
+        """
+        adds already parsed (directory, filename, type, md5) rows to the DB
+        """
+        for file_dir, file_name, file_type, hash in rows:
+            self._hashes[hash] = {'dir': file_dir,
+                                  'name': file_name,
+                                  'type': file_type}
+
     def write(self):
 
         try:
@@ -72,6 +78,8 @@ class PhotoDB:
         with open(self._db_file, 'w', encoding='utf-8') as f_out:
 
             dbwriter = csv.writer(f_out, delimiter=',')
+            # the 'md5' column name is kept for existing DBs, it holds
+            # MediaFile.hash(), whatever output.hash_algorithm is set
             dbwriter.writerow(['directory', 'filename', 'type', 'md5'])
 
             for hash in self._hashes.keys():
@@ -116,8 +124,8 @@ class PhotoDB:
                 filename_data['dir'] + '/' + filename_data['name']
 
             if not media_file.is_equal_to(filename2):
-                logging.critical("MD5 hash collision for two different files,"
-                                 "handled as dupe: %s %s",
+                logging.critical("Content hash collision for two different "
+                                 "files, handled as dupe: %s %s",
                                  media_file.get_path(), filename2)
 
             logging.info("%s was detected as duplicate with %s",
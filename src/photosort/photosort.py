@@ -31,9 +31,10 @@ class PhotoSort:
         self._duplicates_dir = self._config.duplicates_dir()
         self._dir_pattern = self._config.dir_pattern()
         self._file_prefix = self._config.file_prefix()
-        self._inputs = (self._config.sources()[source]['dir']
-                        for source in self._config.sources().keys())
+        self._inputs = [self._config.sources()[source]['dir']
+                        for source in self._config.sources().keys()]
         self._file_mode = self._config.output_chmod()
+        self._hash_algorithm = self._config.hash_algorithm()
 
     def _setup_logging(self, log_level):
         if self._config.log_file():
@@ -52,7 +53,8 @@ class PhotoSort:
 
         for file_dir, file_name in walker.find_media():
             file_path = os.path.join(file_dir, file_name)
-            media_file = media.MediaFile.build_for(file_path)
+            media_file = media.MediaFile.build_for(file_path,
+                                                   self._hash_algorithm)
 
             try:
                 media_file.datetime()
@@ -86,11 +88,10 @@ class PhotoSort:
         overwritting
         """
         walker = walk.WalkForMedia(
-            self._config.output_dir(), ignores=self._inputs)
-        for file_dir, file_name in walker.find_media():
+            self._config.output_dir(), ignores=self._inputs,
+            hash_algorithm=self._hash_algorithm)
+        for file_dir, file_name, media_file in walker.find_hashed_media():
             try:
-                file_path = os.path.join(file_dir, file_name)
-                media_file = media.MediaFile.build_for(file_path)
                 self._photodb.add_to_db(file_dir, file_name, media_file)
             except Exception:
                 logging.critical("Unexpected error: %s", sys.exc_info()[0])
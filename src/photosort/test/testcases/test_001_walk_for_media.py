@@ -5,6 +5,10 @@ __email__ = "miguelangel@ajo.es"
 __copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
 __license__ = "GPLv3"
 
+import os
+import shutil
+import time
+
 import mock
 from photosort import test
 from photosort import walk
@@ -13,30 +17,104 @@ from photosort import walk
 class TestWalkForMedia(test.TestCase):
 
     def setUp(self):
+        super().setUp()
         self.media1 = self.get_data_path('media1')
 
-    def test_directory_inspection(self):
-
         # We need to patch the timecheck (not modified in last 30 seconds)
         # in CI (recent checkout)
-        with mock.patch("photosort.walk.WalkForMedia._file_is_ready") as m:
-            instance = m.return_value
-            instance.method.return_value = True
-            walker = walk.WalkForMedia(self.media1)
-            files = [file for root, file in walker.find_media()]
-            self.assertIn('img1.jpg', files)
+        self._ready_patcher = mock.patch(
+            "photosort.walk.WalkForMedia._file_is_ready", return_value=True)
+        self._file_is_ready = self._ready_patcher.start()
+        self.addCleanup(self._ready_patcher.stop)
+
+    def test_directory_inspection(self):
+        walker = walk.WalkForMedia(self.media1)
+        entries = list(walker.find_media())
+        self.assertIn(walk.MediaEntry(self.media1, 'img1.jpg'), entries)
+        self.assertIn('img1.jpg', [entry.name for entry in entries])
 
     def test_directory_inspection_file_not_ready(self):
+        self._file_is_ready.return_value = False
+        walker = walk.WalkForMedia(self.media1)
+        files = [file for root, file in walker.find_media()]
+        self.assertNotIn('img1.jpg', files)
+
+    def test_nested_and_hidden_directories(self):
+        img1 = os.path.join(self.media1, 'img1.jpg')
+        for directory in ('2013/08', '.hidden', '2013/.thumbnails'):
+            os.makedirs(os.path.join(self._temp_dir, directory))
+        shutil.copy(img1, os.path.join(self._temp_dir, '2013/08/a.jpg'))
+        shutil.copy(img1, os.path.join(self._temp_dir, '.hidden/b.jpg'))
+        shutil.copy(img1, os.path.join(self._temp_dir,
+                                       '2013/.thumbnails/c.jpg'))
+        shutil.copy(img1, os.path.join(self._temp_dir, '2013/._d.jpg'))
+        os.symlink(os.path.join(self._temp_dir, '2013'),
+                   os.path.join(self._temp_dir, '2013/08/loop'))
+
+        walker = walk.WalkForMedia(self._temp_dir)
+        found = [(root, file) for root, file in walker.find_media()]
+        self.assertEqual(found,
+                         [(os.path.join(self._temp_dir, '2013/08'), 'a.jpg')])
+
+    def test_extensions(self):
+        media2 = self.get_data_path('media2')
+        walker = walk.WalkForMedia(media2, extensions=['.MP4', 'm4v'])
+        files = sorted(file for root, file in walker.find_media())
+        self.assertEqual(files, ['mov1.mp4', 'mov1_dup.mp4', 'mov_exif.m4v'])
 
-        with mock.patch("photosort.walk.WalkForMedia._file_is_ready") as m:
-            instance = m.return_value
-            instance.method.return_value = False
-            walker = walk.WalkForMedia(self.media1)
-            files = [file for root, file in walker.find_media()]
-            self.assertNotIn('img1', files)
+    def test_find_hashed_media(self):
+        walker = walk.WalkForMedia(self.media1, n_workers=2)
+        hashes = {entry.name: entry.media_file._hash
+                  for entry in walker.find_hashed_media()}
+        self.assertEqual(hashes['img1.jpg'],
+                         'a35de42abad366d0f6232a4abd0404c8')
+        self.assertEqual(hashes['img1_dup.jpg'], hashes['img1.jpg'])
+
+    def test_find_hashed_media_hash_algorithm(self):
+        walker = walk.WalkForMedia(self.media1, n_workers=2,
+                                   hash_algorithm='sha256')
+        hashes = {entry.name: entry.media_file._hash
+                  for entry in walker.find_hashed_media()}
+        self.assertEqual(len(hashes['img1.jpg']), 64)
+
+    def test_find_hashed_media_close_cancels_pending(self):
+        img1 = os.path.join(self.media1, 'img1.jpg')
+        for n in range(8):
+            shutil.copy(img1, os.path.join(self._temp_dir, '%d.jpg' % n))
+
+        def slow_ready(filename):
+            time.sleep(0.05)
+            return True
+
+        self._file_is_ready.side_effect = slow_ready
+        walker = walk.WalkForMedia(self._temp_dir, n_workers=1)
+        media_files = walker.find_hashed_media()
+        next(media_files)
+        media_files.close()
+        # one job done and at most one running when closed, the rest of
+        # the 4 queued ones are cancelled
+        self.assertLessEqual(self._file_is_ready.call_count, 2)
+
+    def test_find_hashed_media_file_not_ready(self):
+        self._file_is_ready.return_value = False
+        walker = walk.WalkForMedia(self.media1, n_workers=2)
+        self.assertEqual(list(walker.find_hashed_media()), [])
 
     def test_ignores(self):
-        pass
+        img1 = os.path.join(self.media1, 'img1.jpg')
+        for directory in ('inbox/new', 'duplicates', '2013'):
+            os.makedirs(os.path.join(self._temp_dir, directory))
+            shutil.copy(img1, os.path.join(self._temp_dir, directory,
+                                           'img1.jpg'))
+
+        ignores = [os.path.join(self._temp_dir, 'inbox'), 'duplicates']
+        walker = walk.WalkForMedia(self._temp_dir, ignores=iter(ignores))
+        roots = [root for root, file in walker.find_media()]
+        self.assertEqual(roots, [os.path.join(self._temp_dir, '2013')])
+
+        walker = walk.WalkForMedia(os.path.join(self._temp_dir, 'inbox'),
+                                   ignores=ignores)
+        self.assertEqual(list(walker.find_media()), [])
 
 
 if __name__ == '__main__':
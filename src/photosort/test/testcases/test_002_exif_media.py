@@ -9,6 +9,7 @@ import os
 import shutil
 import stat
 
+import mock
 from photosort.test import test as test_main
 from photosort import test
 from photosort import media
@@ -42,6 +43,19 @@ class TestExifMedia(test.TestCase):
         self.assertEqual(str(self.movie.datetime()),
                          "2020-06-18 07:50:31")
 
+    def test_exif_data_cached(self):
+        metadata = {'EXIF:DateTimeOriginal': '2013:08:24 13:05:52'}
+        with mock.patch('photosort.exif.get_metadata',
+                        return_value=metadata) as get_metadata:
+            photo = media.MediaFile.build_for(self.img1)
+            photo.datetime()
+            photo.hash()
+            photo.calculate_datetime(TEST_DIR_FMT)
+            expected_hash = "%s - 2013-08-24 13:05:52" % (
+                self.photo.content_hash())
+            self.assertEqual(photo.hash(), expected_hash)
+        get_metadata.assert_called_once_with(self.img1)
+
     def test_equal_checking(self):
         self.assertTrue(self.photo.is_equal_to(self.img1dup))
 
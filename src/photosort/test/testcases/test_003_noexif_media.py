@@ -5,6 +5,8 @@ __email__ = "miguelangel@ajo.es"
 __copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
 __license__ = "GPLv3"
 
+import hashlib
+
 from photosort import test
 from photosort import media
 
@@ -24,6 +26,27 @@ class TestMovieMedia(test.TestCase):
         same_movie = media.MediaFile.build_for(self.mov1)
         self.assertEqual(same_movie.hash(), expected_hash)
 
+    def test_guess_file_type(self):
+        self.assertEqual(media.MediaFile.guess_file_type('a.JPG'), 'photo')
+        self.assertEqual(media.MediaFile.guess_file_type('a.b.mov'), 'movie')
+        self.assertEqual(media.MediaFile.guess_file_type('a.txt'), 'unknown')
+        self.assertEqual(self.movie.type(), 'movie')
+
+    def test_hash_algorithm(self):
+        with open(self.mov1, 'rb') as f_in:
+            expected_hash = hashlib.blake2b(f_in.read()).hexdigest()
+
+        movie = media.MediaFile.build_for(self.mov1, 'blake2b')
+        self.assertEqual(movie.content_hash(), expected_hash)
+        self.assertEqual(self.movie.content_hash(),
+                         '630569ce2efda22d55d271bfe8ec4428')
+
+    def test_hash_empty_file(self):
+        empty_file = self._temp_dir + '/empty.avi'
+        open(empty_file, 'w').close()
+        movie = media.MediaFile.build_for(empty_file)
+        self.assertEqual(movie.content_hash(), hashlib.md5().hexdigest())
+
     def test_datetime_execption(self):
         with self.assertRaises(media.UnknownDatetime):
             self.movie.datetime()
@@ -0,0 +1,74 @@
+# -*- mode: python; coding: utf-8 -*-
+
+__author__ = "Miguel Angel Ajo Pelayo"
+__email__ = "miguelangel@ajo.es"
+__copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
+__license__ = "GPLv3"
+
+import os.path
+
+from photosort import test
+from photosort import config
+from photosort import photodb
+
+TEST_CONFIG = """
+sources:
+  inbox:
+    dir: '%(output_dir)s/inbox'
+output:
+  dir: '%(output_dir)s'
+  dir_pattern: '%%(year)d'
+  duplicates_dir: 'duplicates'
+  chmod: '0o774'
+  db_file: 'photosort.db'
+"""
+
+TEST_DB = "directory,filename,type,md5\n" \
+          "2013/2013_08_24,img1.jpg,photo,hash1\n"
+
+
+class TestPhotoDB(test.TestCase):
+
+    def setUp(self):
+        super().setUp()
+        config_file = os.path.join(self._temp_dir, 'photosort.yml')
+        with open(config_file, 'w') as f_out:
+            f_out.write(TEST_CONFIG % {'output_dir': self._temp_dir})
+        self.config = config.Config(config_file)
+
+    def _write_db(self, content):
+        with open(self.config.db_file(), 'w') as f_out:
+            f_out.write(content)
+
+    def test_load(self):
+        self._write_db(TEST_DB)
+        db = photodb.PhotoDB(self.config)
+        self.assertEqual(db._hashes, {'hash1': {'dir': '2013/2013_08_24',
+                                                'name': 'img1.jpg',
+                                                'type': 'photo'}})
+
+    def test_load_missing_file(self):
+        db = photodb.PhotoDB(self.config)
+        self.assertEqual(db._hashes, {})
+
+    def test_ingest_rows_merge(self):
+        self._write_db(TEST_DB)
+        db = photodb.PhotoDB(self.config)
+        db._ingest_rows([('2014', 'img2.jpg', 'photo', 'hash2')])
+        self.assertEqual(sorted(db._hashes), ['hash1', 'hash2'])
+
+        db.load()
+        self.assertEqual(sorted(db._hashes), ['hash1'])
+
+    def test_write_and_reload(self):
+        self._write_db(TEST_DB)
+        db = photodb.PhotoDB(self.config)
+        db._ingest_rows([('2014', 'img2.jpg', 'photo', 'hash2')])
+        db.write()
+
+        db2 = photodb.PhotoDB(self.config)
+        self.assertEqual(db2._hashes, db._hashes)
+
+
+if __name__ == '__main__':
+    test.test.main()
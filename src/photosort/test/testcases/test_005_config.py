@@ -0,0 +1,86 @@
+# -*- mode: python; coding: utf-8 -*-
+
+__author__ = "Miguel Angel Ajo Pelayo"
+__email__ = "miguelangel@ajo.es"
+__copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
+__license__ = "GPLv3"
+
+import os.path
+
+from photosort import test
+from photosort import config
+from photosort import exceptions
+
+TEST_SOURCES = """
+sources:
+  inbox:
+    dir: '/mnt/inbox'
+"""
+
+TEST_OUTPUT = """
+output:
+  dir: '/mnt/pictures'
+  dir_pattern: '%(year)d'
+  duplicates_dir: 'duplicates'
+  chmod: 0o774
+  db_file: 'photosort.db'
+"""
+
+
+class TestConfig(test.TestCase):
+
+    def _config_for(self, content):
+        config_file = os.path.join(self._temp_dir, 'photosort.yml')
+        with open(config_file, 'w') as f_out:
+            f_out.write(content)
+        return config.Config(config_file)
+
+    def test_valid_config(self):
+        cfg = self._config_for(TEST_SOURCES + TEST_OUTPUT)
+        self.assertEqual(cfg.output_dir(), '/mnt/pictures')
+        self.assertEqual(cfg.db_file(), '/mnt/pictures/photosort.db')
+        self.assertEqual(cfg.output_chmod(), 0o774)
+        self.assertEqual(cfg.file_prefix(), '')
+
+    def test_legacy_pattern_field(self):
+        cfg = self._config_for(
+            TEST_SOURCES + TEST_OUTPUT.replace('dir_pattern', 'pattern'))
+        self.assertEqual(cfg.dir_pattern(), '%(year)d')
+
+    def test_missing_required_fields(self):
+        with self.assertRaises(exceptions.ConfigError) as ctx:
+            self._config_for(
+                TEST_SOURCES + TEST_OUTPUT.replace('  db_file:', '  other:'))
+        self.assertEqual(ctx.exception.expr, 'output.db_file')
+
+        with self.assertRaises(exceptions.ConfigError) as ctx:
+            self._config_for(TEST_OUTPUT)
+        self.assertEqual(ctx.exception.expr, 'sources')
+
+        with self.assertRaises(exceptions.ConfigError) as ctx:
+            self._config_for(
+                TEST_SOURCES.replace('dir:', 'path:') + TEST_OUTPUT)
+        self.assertEqual(ctx.exception.expr, 'sources.inbox.dir')
+
+    def test_invalid_chmod_value(self):
+        with self.assertRaises(exceptions.ConfigError) as ctx:
+            self._config_for(
+                TEST_SOURCES + TEST_OUTPUT.replace('0o774', "'rwx'"))
+        self.assertEqual(ctx.exception.expr, 'output.chmod')
+
+    def test_hash_algorithm(self):
+        cfg = self._config_for(TEST_SOURCES + TEST_OUTPUT)
+        self.assertEqual(cfg.hash_algorithm(), 'md5')
+
+        cfg = self._config_for(
+            TEST_SOURCES + TEST_OUTPUT + "  hash_algorithm: blake2b\n")
+        self.assertEqual(cfg.hash_algorithm(), 'blake2b')
+
+        with self.assertRaises(exceptions.ConfigError) as ctx:
+            self._config_for(
+                TEST_SOURCES + TEST_OUTPUT + "  hash_algorithm: crc32\n")
+        self.assertEqual(ctx.exception.expr, 'output.hash_algorithm')
+
+
+if __name__ == '__main__':
+    test.test.main()
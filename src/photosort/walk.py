@@ -1,11 +1,12 @@
 # -*- mode: python; coding: utf-8 -*-
-from __future__ import print_function
 
 __author__ = "Miguel Angel Ajo Pelayo"
 __email__ = "miguelangel@ajo.es"
 __copyright__ = "Copyright (C) 2013 Miguel Angel Ajo Pelayo"
 __license__ = "GPLv3"
 
+import collections
+from concurrent import futures
 import fcntl
 import logging
 import os
@@ -13,16 +14,32 @@ import time
 
 from . import media
 
+MediaEntry = collections.namedtuple('MediaEntry', 'root name')
+HashedMediaEntry = collections.namedtuple('HashedMediaEntry',
+                                          'root name media_file')
+
 
 class WalkForMedia:
     """
         A simple class to walk for JPEGs over a root dir
     """
 
-    def __init__(self, rootdir, ignores=[], extensions=[]):
+    def __init__(self, rootdir, ignores=[], extensions=[], n_workers=4,
+                 hash_algorithm='md5'):
         self._rootdir = rootdir
-        self._ignores = ignores
-        self._extensions = extensions
+        # ignores can be directory names or paths, paths are normalized
+        # once here so each directory is checked with a set lookup before
+        # descending into it, which prunes the whole ignored subtree
+        self._ignores = frozenset(ignores)
+        self._ignored_paths = frozenset(os.path.abspath(ignore)
+                                        for ignore in self._ignores)
+        # optional extension whitelist, normalized once for set lookups
+        self._extensions = frozenset(extension.lower().lstrip('.')
+                                     for extension in extensions)
+        # hashing is bound by sequential reads, often from a single disk
+        # or a NAS, so a few workers are enough to keep it busy
+        self._n_workers = n_workers
+        self._hash_algorithm = hash_algorithm
         self._fs_time_skew = self._fs_timeskew_to(rootdir)
 
     def _fs_timeskew_to(self, rootdir):
@@ -118,6 +135,16 @@ class WalkForMedia:
 
     def find_media(self):
 
+        for root, file, file_path in self._find_candidates():
+            if self._file_is_ready(file_path):
+                yield MediaEntry(root, file)
+
+    def _find_candidates(self):
+        """
+        yields (root, file, file_path) for every media file under the
+        root dir, before checking if they are ready
+        """
+
         if not os.path.isdir(self._rootdir):
             logging.error("%s does not exists or it's not mounted, "
                          "cannot find media", self._rootdir)
@@ -127,30 +154,109 @@ class WalkForMedia:
             logging.info("%s is a hidden directory => ignoring", self._rootdir)
             return
 
-        if self._rootdir in self._ignores:
+        if self._is_ignored(self._rootdir):
             logging.info("%s in the list to be ignored => ignoring",
                          self._rootdir)
             return
 
-        for root, subFolders, files in os.walk(self._rootdir):
+        yield from self._walk(self._rootdir)
 
-            subFolders[:] = [
-                sf for sf in subFolders
-                if not sf.startswith('.') and sf not in self._ignores]
+    def _is_ignored(self, path, name=None):
+        if (name or os.path.basename(path)) in self._ignores:
+            return True
+        return os.path.abspath(path) in self._ignored_paths
 
-            for file in files:
+    def _walk(self, directory):
+        """
+        recursive os.scandir walk, the DirEntry file types come from the
+        directory listing itself so no stat is needed per entry
+        """
+        try:
+            entries = os.scandir(directory)
+        except OSError as e:
+            logging.error("Unable to walk dir %s (%s)", directory, e)
+            return
 
-                file_path = os.path.join(root, file)
+        subdirs = []
+        with entries:
+            for entry in entries:
 
-                # skip mac osx AppleDouble files (it puts a ._ in front of the
-                # name) to keep extra information
+                # skip hidden files and directories, and mac osx AppleDouble
+                # files (it puts a ._ in front of the name) to keep extra
+                # information
 
-                if file.startswith('.'):
+                if entry.name.startswith('.'):
                     continue
 
-                media_file = media.MediaFile.build_for(file_path)
-                file_type = media_file.type()
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+
+                if is_dir:
+                    if entry.is_symlink():
+                        continue
+                    if not self._is_ignored(entry.path, entry.name):
+                        subdirs.append(entry.path)
+                    continue
+
+                if self._extensions:
+                    extension = entry.name.rpartition('.')[2].lower()
+                    if extension not in self._extensions:
+                        continue
+
+                file_type = media.MediaFile.guess_file_type(entry.name)
 
                 if file_type != 'unknown':
-                    if self._file_is_ready(file_path):
-                        yield [root, file]
+                    yield directory, entry.name, entry.path
+
+        for subdir in subdirs:
+            yield from self._walk(subdir)
+
+    def find_hashed_media(self):
+        """
+        like find_media, but yields (root, file, media_file) with the
+        readiness checks and the file contents hash already done by a
+        pool of threads (hashlib releases the GIL). The walk only lists
+        directories, so it runs ahead of the disk reads and of the work
+        done by the caller.
+        """
+        pending = collections.deque()
+        max_pending = self._n_workers * 4
+
+        executor = futures.ThreadPoolExecutor(self._n_workers)
+        try:
+            for root, file, file_path in self._find_candidates():
+                media_file = media.MediaFile.build_for(file_path,
+                                                       self._hash_algorithm)
+                future = executor.submit(self._hash_if_ready, media_file)
+                pending.append((root, file, media_file, future))
+
+                if len(pending) >= max_pending:
+                    found = self._hashed(pending.popleft())
+                    if found:
+                        yield found
+
+            while pending:
+                found = self._hashed(pending.popleft())
+                if found:
+                    yield found
+        finally:
+            # when closed early (Ctrl-C, or the caller stops iterating)
+            # don't keep hashing files nobody is going to read
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def _hash_if_ready(self, media_file):
+        if not self._file_is_ready(media_file.get_path()):
+            return False
+        media_file.content_hash()
+        return True
+
+    @staticmethod
+    def _hashed(entry):
+        root, file, media_file, future = entry
+        # errors are not cached by MediaFile, so they will be raised
+        # again to the caller on its own hash() call
+        if future.exception() is None and not future.result():
+            return None
+        return HashedMediaEntry(root, file, media_file)